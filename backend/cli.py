@@ -0,0 +1,110 @@
+# backend/cli.py
+# Operational commands:
+#
+#   python -m backend.cli migrate                 create missing tables
+#   python -m backend.cli archive-orders [--days N]
+#   python -m backend.cli importtime [--top 25]   slowest imports of backend.main
+#   python -m backend.cli coldstart [--max-seconds 2.0] [--runs 3]
+#
+# `coldstart` exits non-zero when importing the app takes longer than
+# the limit, so it can guard startup time in CI.
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+APP_MODULE = "backend.main"
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def migrate(args):
+    from backend.schema import init_db
+    tables = init_db()
+    print("Schema up to date:", ", ".join(tables))
+
+
+def archive(args):
+    from backend.database import SessionLocal
+    from backend.utils.archive import archive_orders
+    db = SessionLocal()
+    try:
+        count = archive_orders(db, older_than_days=args.days)
+    finally:
+        db.close()
+    print(f"Archived {count} orders")
+
+
+def parse_importtime(stderr):
+    # Lines look like "import time:  self [us] | cumulative | module"
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def importtime(args):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        capture_output=True, text=True
+    )
+    rows = parse_importtime(result.stderr)
+    if result.returncode != 0 or not rows:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(result.returncode or 1)
+
+    # -X importtime prints children before their parent, so backend.main's direct
+    # imports are the depth-1 rows between the preceding top-level row and its own
+    app_index = max(i for i, r in enumerate(rows) if r[0] == APP_MODULE and r[3] == 0)
+    start = max((i for i, r in enumerate(rows[:app_index]) if r[3] == 0), default=-1) + 1
+    total_us = rows[app_index][2]
+    children = [r for r in rows[start:app_index] if r[3] == 1]
+    print(f"Importing {APP_MODULE}: {total_us / 1000:.1f} ms across {len(rows)} modules\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module, self_us, cumulative_us, _ in sorted(children, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}")
+
+
+def coldstart(args):
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {APP_MODULE}"], check=True)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"Cold start: best {best:.3f}s, median {statistics.median(timings):.3f}s over {args.runs} runs "
+          f"(limit {args.max_seconds:.3f}s)")
+    if best > args.max_seconds:
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backend.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("migrate", help="create missing database tables").set_defaults(func=migrate)
+
+    p = sub.add_parser("archive-orders", help="move old orders to monthly Arrow files")
+    p.add_argument("--days", type=int, default=None, help="defaults to ARCHIVE_AFTER_DAYS (0 = disabled)")
+    p.set_defaults(func=archive)
+
+    p = sub.add_parser("importtime", help="summarize python -X importtime for the app")
+    p.add_argument("--top", type=int, default=25)
+    p.set_defaults(func=importtime)
+
+    p = sub.add_parser("coldstart", help="fail if importing the app is slower than a limit")
+    p.add_argument("--max-seconds", type=float, default=2.0)
+    p.add_argument("--runs", type=int, default=3)
+    p.set_defaults(func=coldstart)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# backend/config.py
+# Settings are read from the environment (and .env) exactly once per process.
+# Every worker in a multi-process deployment must see the same values,
+# in particular SESSION_SECRET and JWT_SECRET_KEY.
+
+import os
+from functools import lru_cache
+from dotenv import load_dotenv
+
+
+def _flag(name, default):
+    return os.getenv(name, str(default)).lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    def __init__(self):
+        load_dotenv()
+        self.debug = _flag("DEBUG", True)
+        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./SmartShop1.db")
+        self.session_secret = os.getenv("SESSION_SECRET", "your-secret")
+        self.jwt_secret = os.getenv("JWT_SECRET_KEY", "secret")
+        self.https_only = _flag("HTTPS_ONLY", True)
+        self.groq_api_key = os.getenv("GROQ_API_KEY")
+        # "memory" keeps cache/sessions/rate limits in-process (single worker);
+        # "redis" shares them between workers through REDIS_URL.
+        self.state_backend = os.getenv("STATE_BACKEND", "memory")
+        self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.executor_workers = int(os.getenv("EXECUTOR_WORKERS", "8"))
+        self.ask_rate_limit = int(os.getenv("ASK_RATE_LIMIT", "20"))  # requests per minute per user
+        self.run_jobs = _flag("RUN_JOBS", True)
+        # Orders older than this move from the hot tables to Arrow files in archive_dir.
+        # Off by default: archiving deletes rows from orders/order_items, so it is opt-in.
+        self.archive_after_days = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+        self.archive_dir = os.getenv("ARCHIVE_DIR", "data/archive")
+        # Image proxy: resized variants are cached on disk; IMAGE_SOURCE_DIR (if set)
+        # holds <product_id>.jpg/png originals used instead of the remote CDN
+        self.image_cache_dir = os.getenv("IMAGE_CACHE_DIR", "data/img-cache")
+        self.image_cache_max_bytes = int(os.getenv("IMAGE_CACHE_MAX_MB", "256")) * 1024 * 1024
+        self.image_source_dir = os.getenv("IMAGE_SOURCE_DIR")
+        # Click tracking: repeat clicks on one product within the window are dropped
+        # (remembering at most click_dedup_max_keys recent clicks per process);
+        # a gap longer than click_session_gap starts a new session
+        self.click_dedup_window = int(os.getenv("CLICK_DEDUP_WINDOW", "30"))
+        self.click_session_gap = int(os.getenv("CLICK_SESSION_GAP", str(30 * 60)))
+        self.click_dedup_max_keys = int(os.getenv("CLICK_DEDUP_MAX_KEYS", "100000"))
+        self.template_cache_dir = os.getenv("TEMPLATE_CACHE_DIR", "data/jinja-cache")
+
+
+@lru_cache()
+def get_settings():
+    return Settings()
+
+
+settings = get_settings()
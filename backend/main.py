@@ -1,10 +1,9 @@
 from fastapi import FastAPI, Request, Depends, Query, Form
-from fastapi.responses import HTMLResponse, PlainTextResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
-from backend.database import Base, engine,get_db
-from backend.routes import auth, product_clicks, cart,wishlist,cod_checkout, admin
+from backend.database import engine,get_db
+from backend.routes import auth, product_clicks, cart,wishlist,cod_checkout, admin, vr_store, images
 from backend.utils.token import get_current_user_from_cookie
 from backend.models.auth import User
 from backend.models.cart import CartItem
@@ -13,31 +12,61 @@ from backend.models.wishlist import Wishlist
 from backend.routes.tdmodels import model_router
 from backend.models.order import Order
 from backend.models.order_item import OrderItem
-from dotenv import load_dotenv
-import os
-from groq import Groq
+from backend.utils.jobs import runner
+from backend.utils.catalog import get_catalog_payload
+from backend.utils.responses import FastJSONResponse, CompressionMiddleware
+from backend.utils.templating import templates, warm_templates
+from backend.utils.archive import archived_orders_for_user
+from backend import tasks  # registers job handlers
+from backend.utils.chat_memory import build_messages, format_shopping_context, truncate_to_tokens
+from backend.utils.backends import backends, rate_limit
+from backend.config import settings
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import asyncio
+import time
 from concurrent.futures import ThreadPoolExecutor
 
-# --------- Load Environment ---------
-load_dotenv()
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-# --------- Initialize Groq ---------
-groq_client = Groq(api_key=GROQ_API_KEY)
-executor = ThreadPoolExecutor()
+# --------- Groq (created on first question) ---------
+@lru_cache()
+def get_groq_client():
+    # The SDK pulls in httpx/pydantic models; keep it off the startup path
+    from groq import Groq
+    return Groq(api_key=settings.groq_api_key)
+
+executor = None  # created per worker in lifespan()
+
+# --------- Lifespan ---------
+@asynccontextmanager
+async def lifespan(app):
+    # Runs once per worker process: open shared pools, start jobs, then tear down
+    global executor
+    backends.open(settings)
+    warm_templates()
+    executor = ThreadPoolExecutor(max_workers=settings.executor_workers)
+    if settings.run_jobs:
+        runner.start()
+    try:
+        yield
+    finally:
+        if settings.run_jobs:
+            await runner.stop()
+        executor.shutdown(wait=False)
+        backends.close()
+        engine.dispose()
 
 # --------- FastAPI App ---------
-app = FastAPI(debug=True)
+app = FastAPI(debug=settings.debug, lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # --------- Middleware ---------
-app.add_middleware(SessionMiddleware, secret_key="your-secret", https_only=True)
+# Sessions are signed cookies, so any worker can read them as long as the secret is shared
+app.add_middleware(SessionMiddleware, secret_key=settings.session_secret, https_only=settings.https_only)
+app.add_middleware(CompressionMiddleware)
 
 # --------- DB Tables ---------
-Base.metadata.create_all(bind=engine)
+# Created by `python -m backend.cli migrate`, not at import time
 
 # --------- Templates & Static ---------
-templates = Jinja2Templates(directory="backend/templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # --------- Routers ---------
@@ -48,6 +77,8 @@ app.include_router(wishlist.router)
 app.include_router(model_router)
 app.include_router(cod_checkout.router)
 app.include_router(admin.router)
+app.include_router(vr_store.router)
+app.include_router(images.router)
 # --------- Routes ---------
 
 @app.get("/", response_class=HTMLResponse)
@@ -164,72 +195,104 @@ def view_orders(
             "order_items": items,
             "total": total
         })
+    # Older orders live in the archive files; they sort after every hot order
+    orders.extend(archived_orders_for_user(user_id))
 
     return templates.TemplateResponse("orders.html", {"request": request, "orders": orders})
 
 # --------- Groq AI Assistant for /products only ---------
 
-def ask_groq_sync(user_input):
-    response = groq_client.chat.completions.create(
+SYSTEM_PROMPT = "You're a helpful shopping assistant."
+
+def ask_groq_sync(messages):
+    response = get_groq_client().chat.completions.create(
         model="llama3-8b-8192",
-        messages=[
-            {"role": "system", "content": "You're a helpful shopping assistant."},
-            {"role": "user", "content": user_input}
-        ]
+        messages=messages
     )
     return response.choices[0].message.content.strip()
 
-@app.post("/ask", response_class=HTMLResponse)
-async def ask_ai(
-    request: Request,
-    user: str = Depends(get_current_user_from_cookie),
-    from_page: str = Query(default="products")  # Force AI only on /products
-):
+def build_chat(db, user, user_input):
+    # Prior turns + compact cart/wishlist snapshot, trimmed to the token budget
+    cart_items = db.query(CartItem).filter_by(user_id=user).all()
+    wishlist_items = db.query(Wishlist).filter_by(user_id=user).all()
+    context = format_shopping_context(cart_items, wishlist_items)
+    return build_messages(SYSTEM_PROMPT, backends.conversations.history(user), user_input, context)
+
+def ask_with_memory_sync(db, user, user_input):
+    # DB, state-backend and Groq calls all block, so the whole exchange runs in the executor
+    user_input = truncate_to_tokens(user_input)
+    messages = build_chat(db, user, user_input)
+    reply_raw = ask_groq_sync(messages)
+    # Only remember turns that actually got an answer
+    backends.conversations.append(user, "user", user_input)
+    backends.conversations.append(user, "assistant", reply_raw)
+    return reply_raw
+
+async def ask_with_memory(db, user, user_input):
+    return await asyncio.get_event_loop().run_in_executor(
+        executor, ask_with_memory_sync, db, user, user_input
+    )
+
+# Pages that host the form-based assistant; from_page picks the template to re-render
+ASK_PAGES = {"products", "dashboard"}
+
+async def answer_question(request, db, user):
     form = await request.form()
     user_input = form.get("message")
-
     if not user_input:
-        return templates.TemplateResponse(f"{from_page}.html", {
-            "request": request,
-            "user": user,
-            "reply": "Please enter a question."
-        })
-
+        return "Please enter a question."
     try:
-        reply_raw = await asyncio.get_event_loop().run_in_executor(
-            executor, ask_groq_sync, user_input
-        )
-
-        reply = f"""
-        <table border="1" style="width:100%; border-collapse: collapse; margin-top: 10px;">
-            <tr><th style='padding:8px;'>AI Response</th></tr>
-            <tr><td style='padding:8px;'>{reply_raw}</td></tr>
-        </table>
-        """
+        return await ask_with_memory(db, user, user_input)
     except Exception as e:
         print("Groq API error:", e)
-        reply = "Sorry, something went wrong. Please try again."
+        return "Sorry, something went wrong. Please try again."
 
+@app.post("/ask", response_class=HTMLResponse)
+async def ask_ai(
+    request: Request,
+    db: Session = Depends(get_db),
+    user: str = Depends(rate_limit("ask", settings.ask_rate_limit)),
+    from_page: str = Query(default="products")  # Force AI only on /products
+):
+    if from_page not in ASK_PAGES:
+        from_page = "products"
+    reply = await answer_question(request, db, user)
     return templates.TemplateResponse(f"{from_page}.html", {
         "request": request,
         "user": user,
         "reply": reply
     })
 
+@app.post("/ask/fragment", response_class=HTMLResponse)
+async def ask_ai_fragment(
+    request: Request,
+    db: Session = Depends(get_db),
+    user: str = Depends(rate_limit("ask", settings.ask_rate_limit))
+):
+    # Just the reply block, for swapping into the page in place
+    reply = await answer_question(request, db, user)
+    start = time.perf_counter()
+    html = templates.get_template("partials/ai_reply.html").render(reply=reply)
+    render_ms = (time.perf_counter() - start) * 1000
+    return HTMLResponse(html, headers={"Server-Timing": f"render;dur={render_ms:.2f}"})
+
 @app.post("/api/ask")
-async def api_ask_ai(request: Request, user: str = Depends(get_current_user_from_cookie), from_page: str = Query(default="products")):
+async def api_ask_ai(request: Request, db: Session = Depends(get_db), user: str = Depends(rate_limit("ask", settings.ask_rate_limit)), from_page: str = Query(default="products")):
     form = await request.form()
     user_input = form.get("message")
     if not user_input:
-        return JSONResponse({"reply": "Please enter a question."})
+        return FastJSONResponse({"reply": "Please enter a question."})
     try:
-        reply_raw = await asyncio.get_event_loop().run_in_executor(
-            executor, ask_groq_sync, user_input
-        )
+        reply_raw = await ask_with_memory(db, user, user_input)
     except Exception as e:
         print("Groq API error:", e)
         reply_raw = "Sorry, something went wrong. Please try again."
-    return JSONResponse({"reply": reply_raw})
+    return FastJSONResponse({"reply": reply_raw})
+
+@app.post("/api/ask/reset")
+def api_ask_reset(user: str = Depends(get_current_user_from_cookie)):
+    backends.conversations.clear(user)
+    return {"status": "cleared"}
 
 # --------- Error Handler ---------
 
@@ -238,10 +301,9 @@ async def not_found(request: Request, exc):
     return PlainTextResponse("Page not found", status_code=404)
 
 @app.get("/api/products")
-def get_products():
-    import requests
-    response = requests.get("https://dummyjson.com/products?limit=20")
-    return response.json()["products"]
+def get_products(request: Request):
+    # Kept warm by the periodic catalog.refresh job; bytes are pre-serialized and pre-compressed
+    return get_catalog_payload().response(request)
 
 
 
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from backend.database import Base
+from datetime import datetime
+
+class ClickSession(Base):
+    __tablename__ = "click_sessions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_seen_at = Column(DateTime, default=datetime.utcnow)
+    clicks = Column(Integer, default=0)            # clicks kept after deduplication
+    unique_products = Column(Integer, default=0)
+    products = Column(String, default="")          # distinct product ids in click order, comma-separated
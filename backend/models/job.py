@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from backend.database import Base
+from datetime import datetime
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(100), nullable=False, index=True)
+    payload = Column(Text, default="{}")  # JSON-encoded kwargs for the handler
+    status = Column(String(20), default="queued", index=True)  # queued / running / done / failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    run_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_error = Column(Text, nullable=True)
+    claimed_by = Column(String(100), nullable=True)  # worker id holding the lease
+    claimed_at = Column(DateTime, nullable=True)     # refreshed by the worker's heartbeat
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
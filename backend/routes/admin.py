@@ -1,20 +1,28 @@
 from fastapi import APIRouter, Request, Depends, Form, UploadFile, File
-from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from backend.database import SessionLocal, get_db
 from backend.models.auth import User
 from backend.models.product_click import ProductClick
+from backend.models.click_session import ClickSession
 from backend.models.cart import CartItem
 from backend.models.wishlist import Wishlist
+from backend.models.order import Order
 from backend.models.order_item import OrderItem
+from backend.utils.jobs import runner
+from backend.utils.responses import FastJSONResponse
+from backend.utils.archive import COLUMNS as ORDER_EXPORT_COLUMNS, order_rows, iter_archived_rows, monthly_sales
+from backend.utils.templating import templates
+from backend.utils.clickstream import clicks
 from datetime import datetime, timedelta
 import shutil
+import csv
+import io
+import json
 import os
 
 router = APIRouter()
-templates = Jinja2Templates(directory="backend/templates")
 
 UPLOAD_DIR = "static/3Dmodels"
 
@@ -84,6 +92,7 @@ async def upload_model_post(
     try:
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
+        runner.enqueue("model.process", {"filename": filename})
         return RedirectResponse(url="/admin/upload-model?msg=Model%20uploaded%20successfully", status_code=303)
     except:
         return RedirectResponse(url="/admin/upload-model?error=Upload%20failed", status_code=303)
@@ -96,6 +105,14 @@ def delete_model(filename: str = Form(...)):
         return RedirectResponse(url="/admin/upload-model?msg=Model%20deleted", status_code=303)
     return RedirectResponse(url="/admin/upload-model?error=Model%20not%20found", status_code=303)
 
+@router.get("/admin/jobs")
+def job_queue_state(request: Request, db: Session = Depends(get_db)):
+    user = request.session.get("user")
+    role = request.session.get("role")
+    if not user or role != "admin":
+        return JSONResponse({"error": "Admin login required"}, status_code=403)
+    return JSONResponse(runner.stats(db))
+
 @router.get("/admin/analytics", response_class=HTMLResponse)
 def analytics_dashboard(request: Request):
     user = request.session.get("user")
@@ -120,6 +137,10 @@ def get_analytics_data(db: Session = Depends(get_db)):
     weekly_visits = db.query(ProductClick).filter(ProductClick.timestamp >= one_week_ago).count()
     monthly_visits = db.query(ProductClick).filter(ProductClick.timestamp >= one_month_ago).count()
 
+    # Sessions are a closer match to "visits" than raw clicks
+    daily_sessions = db.query(ClickSession).filter(ClickSession.started_at >= one_day_ago).count()
+    avg_clicks = db.query(func.avg(ClickSession.clicks)).filter(ClickSession.started_at >= one_week_ago).scalar()
+
     # Most viewed products
     product_views = (
         db.query(ProductClick.product_id, func.count().label("clicks"))
@@ -149,12 +170,68 @@ def get_analytics_data(db: Session = Depends(get_db)):
     wishlist_count = db.query(Wishlist).count()
     cart_count = db.query(CartItem).count()
 
-    return JSONResponse({
+    return FastJSONResponse({
         "daily_visits": daily_visits,
         "weekly_visits": weekly_visits,
         "monthly_visits": monthly_visits,
+        "daily_sessions": daily_sessions,
+        "avg_clicks_per_session": round(avg_clicks or 0, 2),
+        "click_filter": clicks.stats,
         "most_viewed_products": most_viewed_products,
         "sales_trend": sales_trend,
+        "archived_monthly_sales": monthly_sales(),
         "wishlist_count": wishlist_count,
         "cart_count": cart_count
-    })
\ No newline at end of file
+    })
+
+def _export_rows(include_archive):
+    # Own session: the response body is produced after the request's get_db has closed
+    db = SessionLocal()
+    try:
+        if include_archive:
+            yield from iter_archived_rows()
+        # Keyset-paged chunks with one items query per chunk, not per order
+        last_id = 0
+        while True:
+            orders = db.query(Order).filter(Order.id > last_id).order_by(Order.id).limit(500).all()
+            if not orders:
+                break
+            last_id = orders[-1].id
+            items_by_order = {}
+            for item in db.query(OrderItem).filter(OrderItem.order_id.in_([o.id for o in orders])).all():
+                items_by_order.setdefault(item.order_id, []).append(item)
+            for order in orders:
+                yield from order_rows(order, items_by_order.get(order.id, []))
+            db.expunge_all()
+    finally:
+        db.close()
+
+def _csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=ORDER_EXPORT_COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+def _ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, default=str) + "\n"
+
+@router.get("/admin/orders/export")
+def export_orders(request: Request, format: str = "csv", include_archive: bool = True):
+    user = request.session.get("user")
+    role = request.session.get("role")
+    if not user or role != "admin":
+        return RedirectResponse(url="/login?msg=Admin%20login%20required", status_code=303)
+    rows = _export_rows(include_archive)
+    if format == "ndjson":
+        return StreamingResponse(_ndjson_lines(rows), media_type="application/x-ndjson",
+                                 headers={"Content-Disposition": "attachment; filename=orders.ndjson"})
+    if format == "csv":
+        return StreamingResponse(_csv_lines(rows), media_type="text/csv",
+                                 headers={"Content-Disposition": "attachment; filename=orders.csv"})
+    return JSONResponse({"error": "format must be csv or ndjson"}, status_code=400)
\ No newline at end of file
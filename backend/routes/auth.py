@@ -2,18 +2,16 @@
 
 from fastapi import APIRouter, HTTPException, Depends, Form, Response, Cookie,Request
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
-from fastapi.templating import Jinja2Templates
+from functools import lru_cache
 from backend.database import SessionLocal
 from backend.models.auth import User
 from backend.utils.token import create_access_token
+from backend.utils.templating import templates
 from fastapi.responses import RedirectResponse,HTMLResponse
 from fastapi import status
 
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-templates = Jinja2Templates(directory="backend/templates")
 
 def get_db():
     db = SessionLocal()
@@ -22,13 +20,19 @@ def get_db():
     finally:
         db.close()
 
+# passlib loads the bcrypt backend on construction; defer it to the first login
+@lru_cache()
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 # Utility: Hash password
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 # Utility: Verify password
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 @router.post("/register")
 def register_user(
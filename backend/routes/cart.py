@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import JSONResponse, RedirectResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from backend.database import get_db
 from backend.utils.token import get_current_user_from_cookie
@@ -7,6 +8,14 @@ from backend.models.cart import CartItem
 
 router = APIRouter()
 
+
+class CartItemIn(BaseModel):
+    product_id: int
+    title: str = Field(..., min_length=1)
+    price: float
+    image: str = Field(..., min_length=1)
+
+
 @router.post("/add-to-cart/{product_id}")
 def add_to_cart(
     product_id: int,
@@ -39,6 +48,29 @@ def add_to_cart(
     return {"message": "✅ Added to cart!"}
 
 
+@router.post("/cart/add")
+def add_to_cart_json(
+    body: CartItemIn,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_from_cookie)
+):
+    # JSON-body variant used by the VR store; malformed bodies are rejected with 422
+    exists = db.query(CartItem).filter_by(user_id=user_id, product_id=body.product_id).first()
+    if exists:
+        return {"message": "Already in cart"}
+
+    item = CartItem(
+        user_id=user_id,
+        product_id=body.product_id,
+        title=body.title,
+        price=body.price,
+        image=body.image
+    )
+    db.add(item)
+    db.commit()
+    return {"message": "✅ Added to cart!"}
+
+
 @router.post("/cart/remove/{item_id}")
 def remove_from_cart(
     item_id: int,
@@ -8,6 +8,7 @@ from backend.models.order import Order
 from backend.models.order_item import OrderItem
 from backend.models.cart import CartItem
 from backend.utils.token import get_current_user_from_cookie
+from backend.utils.jobs import runner
 
 router = APIRouter()
 
@@ -37,4 +38,6 @@ def place_cod_order(
     db.query(CartItem).filter_by(user_id=user_id).delete()
     db.commit()
 
+    runner.enqueue("order.confirmation", {"order_id": order.id}, db=db)
+
     return RedirectResponse(url="/orders", status_code=302)
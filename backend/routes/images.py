@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Request, Query, HTTPException
+from fastapi.responses import FileResponse, Response
+
+from backend.utils.images import FORMATS, get_original, get_variant, negotiate_format, pick_width
+
+router = APIRouter()
+
+# /img/{id} is not content-addressed: its bytes change when the product's
+# source image does, so browsers keep it briefly and then revalidate by ETag
+CACHE_CONTROL = "public, max-age=300"
+
+
+def _file_response(request, path, media_type, etag):
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag, "Vary": "Accept"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+@router.get("/img/{product_id}")
+async def product_image(request: Request, product_id: int, w: int = Query(default=None)):
+    width = pick_width(w)
+    fmt = negotiate_format(request.headers.get("accept"))
+    try:
+        result = await get_variant(product_id, width, fmt)
+    except Exception as e:
+        # Pillow missing or the image wouldn't decode: serve the original unresized
+        if not isinstance(e, RuntimeError):  # RuntimeError just means no Pillow
+            print("Image proxy error, serving original:", e)
+        try:
+            original = await get_original(product_id)
+        except Exception as e:
+            print("Image proxy error:", e)
+            raise HTTPException(status_code=502, detail="Image unavailable")
+        if original is None:
+            raise HTTPException(status_code=404, detail="Image not found")
+        path, media_type, digest = original
+        return _file_response(request, path, media_type, f'"{digest}-orig"')
+    if result is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    path, digest = result
+    return _file_response(request, path, FORMATS[fmt], f'"{digest}-{width}-{fmt}"')
@@ -1,27 +1,30 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from backend.database import get_db
 from backend.models.product_click import ProductClick
+from backend.utils.clickstream import clicks
 from backend.utils.token import get_current_user_from_cookie
+from backend.utils.responses import FastJSONResponse
 
 router = APIRouter()
 
+
+class ClickIn(BaseModel):
+    product_id: int
+
+
 @router.post("/track-click")
-async def track_click(
+def track_click(
+    body: ClickIn,
     request: Request,
     db: Session = Depends(get_db)
 ):
+    # Non-integer ids are rejected with 422 before they reach the session rows
     user_id = get_current_user_from_cookie(request)
-    data = await request.json()
-    product_id = data.get("product_id")
-    if not product_id:
-        return {"error": "Missing product_id"}
-
-    click = ProductClick(product_id=product_id, user_id=user_id)
-    db.add(click)
-    db.commit()
-    return {"message": "Click tracked"}
+    stored = clicks.record(db, user_id, body.product_id, request.headers.get("user-agent"))
+    return {"message": "Click tracked" if stored else "Click ignored"}
 
 @router.get("/top-clicked")
 def get_top_clicked(request: Request, db: Session = Depends(get_db)):
@@ -38,4 +41,4 @@ def get_top_clicked(request: Request, db: Session = Depends(get_db)):
         .limit(10)
         .all()
     )
-    return [pid[0] for pid in top_ids]
+    return FastJSONResponse([pid[0] for pid in top_ids])
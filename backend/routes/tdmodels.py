@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from backend.utils.responses import FastJSONResponse
 import os
 
 model_router = APIRouter()
@@ -7,6 +8,6 @@ model_router = APIRouter()
 def list_3d_models():
     model_dir = "static/3Dmodels"
     if not os.path.exists(model_dir):
-        return []
+        return FastJSONResponse([])
     glb_files = [f for f in os.listdir(model_dir) if f.endswith(".glb")]
-    return [{"name": os.path.splitext(f)[0], "file": f"/static/3Dmodels/{f}"} for f in glb_files]
+    return FastJSONResponse([{"name": os.path.splitext(f)[0], "file": f"/static/3Dmodels/{f}"} for f in glb_files])
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Request, Query, HTTPException
+from fastapi.responses import Response, JSONResponse, StreamingResponse
+import json
+
+from backend.utils.catalog import get_catalog
+from backend.utils.vr_layout import get_feed
+
+router = APIRouter()
+
+def _not_modified(request, feed):
+    return request.headers.get("if-none-match") == feed.etag
+
+@router.get("/api/vr/products.bin")
+def vr_products_packed(request: Request):
+    feed = get_feed(get_catalog())
+    headers = {"ETag": feed.etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, feed):
+        return Response(status_code=304, headers=headers)
+    return Response(feed.payload, media_type="application/octet-stream", headers=headers)
+
+@router.get("/api/vr/layout")
+def vr_layout(request: Request):
+    feed = get_feed(get_catalog())
+    headers = {"ETag": feed.etag, "Cache-Control": "no-cache"}
+    if _not_modified(request, feed):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(feed.layout(), headers=headers)
+
+@router.get("/api/vr/layout/stream")
+def vr_layout_stream(z: float = Query(default=20.0), v: str = Query(default=None)):
+    # NDJSON: geometry first, then one aisle per line, nearest to the camera first.
+    # v is the products.bin ETag the client decoded; slot indexes only make
+    # sense against that catalog, so a different version is refused.
+    feed = get_feed(get_catalog())
+    layout = feed.layout()
+    if v is not None and v != layout["version"]:
+        raise HTTPException(status_code=409, detail="Catalog changed, reload products.bin")
+
+    def chunks():
+        yield json.dumps({"version": layout["version"], "geometry": layout["geometry"]}, separators=(",", ":")) + "\n"
+        for aisle in feed.aisles_nearest(z):
+            yield json.dumps(aisle, separators=(",", ":")) + "\n"
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson", headers={"ETag": feed.etag})
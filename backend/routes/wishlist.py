@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
+from typing import Optional
 from backend.database import get_db
 from backend.utils.token import get_current_user_from_cookie
 from backend.models.wishlist import Wishlist
@@ -9,6 +11,15 @@ from backend.models.wishlist import Wishlist
 
 router = APIRouter()
 
+
+class WishlistItemIn(BaseModel):
+    product_id: int
+    title: str = Field(..., min_length=1)
+    price: float
+    image_url: Optional[str] = None
+    image: Optional[str] = None  # accepted as an alias of image_url
+
+
 @router.post("/add-to-wishlist/{product_id}")
 def add_to_wishlist(
     product_id: int,
@@ -40,6 +51,32 @@ def add_to_wishlist(
     db.commit()
     return {"message": "✅ Added to wishlist!"}
 
+# POST /wishlist/add  (JSON body, used by the VR store)
+@router.post("/wishlist/add")
+def add_to_wishlist_json(
+    body: WishlistItemIn,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_from_cookie)
+):
+    image = body.image_url or body.image
+    if not image:
+        raise HTTPException(status_code=422, detail="image_url is required")
+
+    exists = db.query(Wishlist).filter_by(user_id=user_id, product_id=body.product_id).first()
+    if exists:
+        return {"message": "Already in wishlist"}
+
+    item = Wishlist(
+        user_id=user_id,
+        product_id=body.product_id,
+        title=body.title,
+        price=body.price,
+        image_url=image
+    )
+    db.add(item)
+    db.commit()
+    return {"message": "✅ Added to wishlist!"}
+
 # POST /wishlist/remove/{item_id}
 @router.post("/wishlist/remove/{item_id}")
 def remove_from_wishlist(item_id: int, db: Session = Depends(get_db), user: int = Depends(get_current_user_from_cookie)):
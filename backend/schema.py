@@ -0,0 +1,14 @@
+# backend/schema.py
+# Schema setup, run explicitly (python -m backend.cli migrate) instead of
+# on every import of backend.main.
+
+from backend.database import Base, engine
+
+def import_models():
+    # Registering every model on Base.metadata is an import side effect
+    from backend.models import auth, cart, click_session, job, order, order_item, product_click, wishlist  # noqa: F401
+
+def init_db():
+    import_models()
+    Base.metadata.create_all(bind=engine)
+    return sorted(Base.metadata.tables)
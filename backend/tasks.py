@@ -0,0 +1,63 @@
+# backend/tasks.py
+# Deferred work run by backend.utils.jobs.runner. Handlers take the
+# enqueued payload as keyword arguments and raise to trigger a retry.
+
+import os
+from backend.database import SessionLocal
+from backend.models.order import Order
+from backend.models.order_item import OrderItem
+from backend.config import settings
+from backend.utils.archive import archive_orders, pyarrow_available
+from backend.utils.catalog import refresh_catalog
+from backend.utils.jobs import runner
+
+MODEL_DIR = "static/3Dmodels"
+GLB_MAGIC = b"glTF"
+
+@runner.register("catalog.refresh", concurrency=1)
+def refresh_catalog_job():
+    products = refresh_catalog()
+    print(f"Catalog refreshed: {len(products)} products")
+
+@runner.register("order.confirmation", concurrency=4, max_attempts=5)
+def send_order_confirmation(order_id: int):
+    db = SessionLocal()
+    try:
+        order = db.query(Order).filter(Order.id == order_id).first()
+        if not order:
+            return
+        items = db.query(OrderItem).filter(OrderItem.order_id == order_id).all()
+        total = sum(item.price for item in items)
+        # No mail transport configured yet; log what would be sent
+        print(f"Order #{order.id} confirmation for user {order.user_id}: {len(items)} items, total ${total}")
+    finally:
+        db.close()
+
+@runner.register("model.process", concurrency=2)
+def process_uploaded_model(filename: str):
+    file_path = os.path.join(MODEL_DIR, filename)
+    if not os.path.exists(file_path):
+        return
+    with open(file_path, "rb") as f:
+        header = f.read(4)
+    if header != GLB_MAGIC:
+        os.remove(file_path)
+        print(f"Removed invalid model upload: {filename}")
+
+def archive_old_orders():
+    db = SessionLocal()
+    try:
+        count = archive_orders(db)
+        print(f"Archived {count} orders")
+    finally:
+        db.close()
+
+runner.periodic("catalog.refresh", "*/10 * * * *")
+
+# Archiving deletes hot rows, so it only runs when explicitly enabled and pyarrow is installed
+if settings.archive_after_days > 0:
+    if pyarrow_available():
+        runner.register("orders.archive", concurrency=1)(archive_old_orders)
+        runner.periodic("orders.archive", "30 3 * * *")
+    else:
+        print("ARCHIVE_AFTER_DAYS is set but pyarrow is not installed; order archiving disabled")
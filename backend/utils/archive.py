@@ -0,0 +1,229 @@
+# backend/utils/archive.py
+# Cold storage for old orders. Orders older than ARCHIVE_AFTER_DAYS are
+# flattened to one row per order item and written to Arrow IPC files, one
+# per month per archiving run (orders_YYYY_MM.<run>.arrow), then deleted
+# from the hot tables. Existing files are never rewritten. Arrow files are
+# memory-mapped on read, so aggregations only touch the columns they need.
+# Requires the optional 'pyarrow' package.
+
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from backend.config import settings
+from backend.models.order import Order
+from backend.models.order_item import OrderItem
+
+COLUMNS = [
+    "order_id", "user_id", "status", "payment_mode", "order_created_at",
+    "item_id", "product_id", "title", "price", "image", "item_created_at",
+]
+
+
+def _pa():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.ipc
+    except ImportError:
+        raise RuntimeError("Order archiving requires the 'pyarrow' package (pip install pyarrow)")
+    return pyarrow
+
+
+def pyarrow_available():
+    try:
+        _pa()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _schema(pa):
+    return pa.schema([
+        ("order_id", pa.int64()),
+        ("user_id", pa.string()),  # orders store the login subject, which is a username
+        ("status", pa.string()),
+        ("payment_mode", pa.string()),
+        ("order_created_at", pa.timestamp("us")),
+        ("item_id", pa.int64()),
+        ("product_id", pa.int64()),
+        ("title", pa.string()),
+        ("price", pa.float64()),
+        ("image", pa.string()),
+        ("item_created_at", pa.timestamp("us")),
+    ])
+
+
+def archive_files():
+    if not os.path.isdir(settings.archive_dir):
+        return []
+    return sorted(
+        os.path.join(settings.archive_dir, f)
+        for f in os.listdir(settings.archive_dir)
+        if f.startswith("orders_") and f.endswith(".arrow")
+    )
+
+
+def _read(path, columns=None):
+    pa = _pa()
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+
+def _month_of(path):
+    # orders_2025_03.20260101T033000.arrow -> "2025-03"
+    return os.path.basename(path)[len("orders_"):len("orders_YYYY_MM")].replace("_", "-")
+
+
+def order_rows(order, items):
+    base = {
+        "order_id": order.id,
+        "user_id": None if order.user_id is None else str(order.user_id),
+        "status": order.status,
+        "payment_mode": order.payment_mode,
+        "order_created_at": order.created_at,
+    }
+    if not items:
+        return [dict(base, item_id=None, product_id=None, title=None, price=None, image=None, item_created_at=None)]
+    return [
+        dict(
+            base,
+            item_id=item.id,
+            product_id=item.product_id,
+            title=item.title,
+            price=None if item.price is None else float(item.price),
+            image=item.image,
+            item_created_at=item.created_at,
+        )
+        for item in items
+    ]
+
+
+def _archived_ids(pa, month):
+    # Order ids already in this month's files; reads one memory-mapped column per file
+    ids = set()
+    for path in archive_files():
+        if _month_of(path) == month:
+            ids.update(_read(path, ["order_id"])["order_id"].to_pylist())
+    return ids
+
+
+def archive_orders(db, older_than_days=None, batch_size=500):
+    """Move orders older than the cutoff into monthly archive files.
+
+    Batches are streamed into one new file per month, so earlier files are
+    never rewritten. Rows are deleted only after every file of the run is
+    complete, and orders already present in a month's files are skipped,
+    so an interrupted run can simply be repeated. Returns the number of
+    orders archived.
+    """
+    days = settings.archive_after_days if older_than_days is None else older_than_days
+    if days <= 0:
+        return 0  # archiving disabled
+    pa = _pa()
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    os.makedirs(settings.archive_dir, exist_ok=True)
+    schema = _schema(pa)
+    run = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+
+    writers = {}     # month -> (tmp path, final path, sink, writer, already archived ids)
+    archived_ids = []
+    last_id = 0
+    try:
+        while True:
+            orders = (
+                db.query(Order)
+                .filter(Order.created_at < cutoff, Order.id > last_id)
+                .order_by(Order.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not orders:
+                break
+            last_id = orders[-1].id
+
+            order_ids = [o.id for o in orders]
+            items_by_order = defaultdict(list)
+            for item in db.query(OrderItem).filter(OrderItem.order_id.in_(order_ids)).all():
+                items_by_order[item.order_id].append(item)
+
+            by_month = defaultdict(list)
+            for order in orders:
+                month = order.created_at.strftime("%Y_%m")
+                if month not in writers:
+                    path = os.path.join(settings.archive_dir, f"orders_{month}.{run}.arrow")
+                    sink = pa.OSFile(path + ".tmp", "wb")
+                    writers[month] = (path + ".tmp", path, sink, pa.ipc.new_file(sink, schema),
+                                      _archived_ids(pa, month.replace("_", "-")))
+                archived_ids.append(order.id)
+                if order.id not in writers[month][4]:
+                    by_month[month].extend(order_rows(order, items_by_order[order.id]))
+
+            for month, rows in by_month.items():
+                writers[month][3].write_table(pa.Table.from_pylist(rows, schema=schema))
+            db.expunge_all()  # keep the session from holding every archived order
+    except BaseException:
+        for tmp_path, _, sink, writer, _ in writers.values():
+            writer.close()
+            sink.close()
+            os.remove(tmp_path)
+        raise
+
+    for tmp_path, path, sink, writer, _ in writers.values():
+        writer.close()
+        sink.close()
+        os.replace(tmp_path, path)  # readers never see a half-written file
+
+    for start in range(0, len(archived_ids), batch_size):
+        chunk = archived_ids[start:start + batch_size]
+        db.query(OrderItem).filter(OrderItem.order_id.in_(chunk)).delete(synchronize_session=False)
+        db.query(Order).filter(Order.id.in_(chunk)).delete(synchronize_session=False)
+        db.commit()
+    return len(archived_ids)
+
+
+def iter_archived_rows(user_id=None):
+    # One record batch in memory at a time
+    if not archive_files():
+        return
+    pa = _pa()
+    for path in archive_files():
+        table = _read(path)
+        if user_id is not None:
+            table = table.filter(pa.compute.equal(table["user_id"], str(user_id)))
+        for batch in table.to_batches(max_chunksize=1000):
+            yield from batch.to_pylist()
+
+
+def archived_orders_for_user(user_id):
+    # Same shape as the hot-path dicts built for orders.html
+    orders = {}
+    for row in iter_archived_rows(user_id):
+        order = orders.setdefault(row["order_id"], {
+            "id": row["order_id"],
+            "created_at": row["order_created_at"],
+            "status": row["status"],
+            "payment_mode": row["payment_mode"],
+            "order_items": [],
+            "total": 0,
+        })
+        if row["item_id"] is not None:
+            order["order_items"].append({"title": row["title"], "price": row["price"], "image": row["image"]})
+            order["total"] += row["price"] or 0
+    return sorted(orders.values(), key=lambda o: o["created_at"], reverse=True)
+
+
+def monthly_sales():
+    """Items sold and revenue per month across all archive files."""
+    if not archive_files():
+        return []
+    pa = _pa()
+    totals = {}
+    for path in archive_files():
+        table = _read(path, ["item_id", "price"])
+        sold = table.filter(pa.compute.is_valid(table["item_id"]))
+        month = totals.setdefault(_month_of(path), {"month": _month_of(path), "sales": 0, "revenue": 0})
+        month["sales"] += sold.num_rows
+        month["revenue"] += pa.compute.sum(sold["price"]).as_py() or 0
+    return [totals[m] for m in sorted(totals)]
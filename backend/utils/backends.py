@@ -0,0 +1,179 @@
+# backend/utils/backends.py
+# Pluggable state shared by request handlers: a key/value cache, the
+# assistant's conversation store and a rate limiter. With the "memory"
+# backend state lives in this process; with "redis" it lives in a
+# Redis-compatible server so every worker sees the same data.
+
+import json
+import time
+import threading
+from collections import OrderedDict
+
+from fastapi import Depends, HTTPException
+
+from backend.utils.chat_memory import ConversationStore, MAX_TURNS, SESSION_TTL
+from backend.utils.token import get_current_user_from_cookie
+
+
+class MemoryCache:
+    """Bounded in-process LRU with per-key TTLs.
+
+    Every insert path enforces ``max_keys`` by dropping the least
+    recently used entry, so eviction is O(1).
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._data = OrderedDict()  # key -> (expires_at or None, value), oldest first
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def _store(self, key, expires_at, value):
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_keys:
+            self._data.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            return entry[1] if entry else None
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, time.monotonic() + ttl if ttl else None, value)
+
+    def add(self, key, value, ttl=None):
+        # Set only if absent; returns True when this caller won
+        with self._lock:
+            now = time.monotonic()
+            if self._live(key, now):
+                return False
+            self._store(key, now + ttl if ttl else None, value)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key, ttl):
+        with self._lock:
+            now = time.monotonic()
+            entry = self._live(key, now)
+            if entry is None:
+                self._store(key, now + ttl, 1)
+                return 1
+            expires_at, value = entry
+            self._store(key, expires_at, value + 1)
+            return value + 1
+
+    def close(self):
+        self._data.clear()
+
+
+class RedisCache:
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("STATE_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self._pool = redis.ConnectionPool.from_url(url)
+        self._client = redis.Redis(connection_pool=self._pool)
+        self._client.ping()  # fail at startup rather than on the first request
+
+    def get(self, key):
+        value = self._client.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, json.dumps(value), ex=ttl)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(key, json.dumps(value), ex=ttl, nx=True))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def incr(self, key, ttl):
+        count = self._client.incr(key)
+        if count == 1:
+            self._client.expire(key, ttl)
+        return count
+
+    def close(self):
+        self._pool.disconnect()
+
+
+class CacheConversationStore:
+    """ConversationStore API on top of a shared cache; the TTL does the expiry."""
+
+    def __init__(self, cache, ttl=SESSION_TTL, max_turns=MAX_TURNS):
+        self.cache = cache
+        self.ttl = ttl
+        self.max_turns = max_turns
+
+    def history(self, user_id):
+        return [tuple(turn) for turn in self.cache.get(f"chat:{user_id}") or []]
+
+    def append(self, user_id, role, content):
+        turns = self.cache.get(f"chat:{user_id}") or []
+        turns.append([role, content])
+        self.cache.set(f"chat:{user_id}", turns[-self.max_turns:], ttl=self.ttl)
+
+    def clear(self, user_id):
+        self.cache.delete(f"chat:{user_id}")
+
+
+class RateLimiter:
+    """Fixed-window counter per key, stored in the active cache."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def hit(self, key, limit, window=60):
+        bucket = int(time.time() // window)
+        return self.cache.incr(f"rl:{key}:{bucket}", window) <= limit
+
+
+class Backends:
+    def __init__(self):
+        # Usable before open() so imports and scripts work without a lifespan
+        self.cache = MemoryCache()
+        self.conversations = ConversationStore()
+        self.limiter = RateLimiter(self.cache)
+
+    def open(self, settings):
+        if settings.state_backend == "redis":
+            self.cache = RedisCache(settings.redis_url)
+            self.conversations = CacheConversationStore(self.cache)
+        elif settings.state_backend == "memory":
+            self.cache = MemoryCache()
+            self.conversations = ConversationStore()
+        else:
+            raise ValueError(f"Unknown STATE_BACKEND: {settings.state_backend}")
+        self.limiter = RateLimiter(self.cache)
+
+    def close(self):
+        self.cache.close()
+
+
+backends = Backends()
+
+
+def rate_limit(scope, limit):
+    # Dependency factory: per-user requests per minute for one route group
+    def dependency(user: str = Depends(get_current_user_from_cookie)):
+        if not backends.limiter.hit(f"{scope}:{user}", limit):
+            raise HTTPException(status_code=429, detail="Too many requests, slow down")
+        return user
+    return dependency
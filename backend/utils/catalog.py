@@ -0,0 +1,61 @@
+# backend/utils/catalog.py
+# Upstream product catalog. The authoritative copy lives in the shared
+# state backend, so one worker's catalog.refresh job updates every worker.
+# Each worker keeps a local copy (with pre-serialized bytes) and rechecks
+# the shared one every LOCAL_CHECK seconds.
+
+import time
+import requests
+from backend.utils.backends import backends
+from backend.utils.responses import PrecomputedJSON
+
+PRODUCTS_URL = "https://dummyjson.com/products?limit=20"
+CATALOG_TTL = 15 * 60        # seconds before the catalog counts as stale; the refresh job normally keeps it fresh
+STALE_KEEP = 24 * 60 * 60    # how long the shared copy survives, so it can be served while upstream is down
+LOCAL_CHECK = 30             # seconds between a worker's reads of the shared copy
+SHARED_KEY = "catalog:products"
+
+_catalog = {"products": None, "payload": None, "fetched_at": None, "checked_at": 0.0}
+
+def fetch_products():
+    response = requests.get(PRODUCTS_URL, timeout=10)
+    response.raise_for_status()
+    return response.json()["products"]
+
+def _install(products, fetched_at):
+    # Serialize and compress once per version; /api/products serves these bytes as-is
+    _catalog["payload"] = PrecomputedJSON(products)
+    _catalog["products"] = products
+    _catalog["fetched_at"] = fetched_at
+
+def refresh_catalog():
+    products = fetch_products()
+    fetched_at = time.time()
+    backends.cache.set(SHARED_KEY, {"fetched_at": fetched_at, "products": products}, ttl=STALE_KEEP)
+    _install(products, fetched_at)
+    _catalog["checked_at"] = time.monotonic()
+    return products
+
+def get_catalog():
+    now = time.monotonic()
+    if _catalog["products"] is not None and now - _catalog["checked_at"] < LOCAL_CHECK:
+        return _catalog["products"]
+
+    shared = backends.cache.get(SHARED_KEY)
+    if shared and shared["fetched_at"] != _catalog["fetched_at"]:
+        _install(shared["products"], shared["fetched_at"])
+    _catalog["checked_at"] = now
+
+    if shared is None or time.time() - shared["fetched_at"] > CATALOG_TTL:
+        try:
+            return refresh_catalog()
+        except Exception as e:
+            if _catalog["products"] is None:
+                raise
+            # Upstream is down: keep serving the last good catalog
+            print("Catalog refresh failed, serving stale copy:", e)
+    return _catalog["products"]
+
+def get_catalog_payload():
+    get_catalog()
+    return _catalog["payload"]
@@ -0,0 +1,147 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+
+# --------- Limits ---------
+TOKEN_BUDGET = 1500        # max estimated prompt tokens sent to the model
+MAX_INPUT_TOKENS = 500     # longer questions are cut to this before budgeting
+MAX_SESSIONS = 1000        # users kept in memory before LRU eviction
+MAX_TURNS = 40             # hard cap on stored turns per user
+SESSION_TTL = 30 * 60      # seconds of inactivity before a session expires
+SUMMARY_CHARS = 400        # max length of the "earlier questions" summary
+CONTEXT_ITEMS = 10         # cart/wishlist items attached per list
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough BPE-style estimate: one token per punctuation mark and
+    # one per ~4 characters of each word. Close enough for budgeting.
+    count = 0
+    for piece in _TOKEN_RE.findall(text or ""):
+        count += max(1, (len(piece) + 3) // 4)
+    return count + 4  # per-message overhead (role, separators)
+
+
+def truncate_to_tokens(text, limit=MAX_INPUT_TOKENS):
+    # Cut where the estimate passes the limit. A word-piece that overflows
+    # (e.g. CJK text, which has no spaces) keeps ~4 characters per token left.
+    count = 4
+    for match in _TOKEN_RE.finditer(text or ""):
+        cost = max(1, (len(match.group()) + 3) // 4)
+        if count + cost > limit:
+            end = match.start() + max(0, limit - count) * 4 if cost > 1 else match.start()
+            return text[:end].rstrip() or text[:4]
+        count += cost
+    return text
+
+
+class ConversationStore:
+    """Per-user chat history with LRU eviction and an inactivity TTL."""
+
+    def __init__(self, max_sessions=MAX_SESSIONS, ttl=SESSION_TTL, max_turns=MAX_TURNS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self._sessions = OrderedDict()  # user_id -> (last_seen, [(role, content), ...])
+        self._lock = threading.Lock()
+
+    def _expire(self, now):
+        # Oldest sessions sit at the front, so stop at the first live one
+        while self._sessions:
+            user_id, (last_seen, _) = next(iter(self._sessions.items()))
+            if now - last_seen < self.ttl:
+                break
+            self._sessions.popitem(last=False)
+
+    def history(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(user_id)
+            if entry is None:
+                return []
+            # Reading counts as activity; refresh last_seen so the order stays
+            # sorted by it, which _expire relies on
+            self._sessions[user_id] = (now, entry[1])
+            self._sessions.move_to_end(user_id)
+            return list(entry[1])
+
+    def append(self, user_id, role, content):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            _, turns = self._sessions.pop(user_id, (now, []))
+            turns.append((role, content))
+            if len(turns) > self.max_turns:
+                del turns[:len(turns) - self.max_turns]
+            self._sessions[user_id] = (now, turns)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def clear(self, user_id):
+        with self._lock:
+            self._sessions.pop(user_id, None)
+
+
+def _summarize(turns):
+    # Keep only what the user asked; replies are the bulky part
+    questions = [content.split("\n", 1)[0][:80] for role, content in turns if role == "user"]
+    if not questions:
+        return None
+    summary = "Earlier in this chat the user asked: " + "; ".join(questions)
+    if len(summary) > SUMMARY_CHARS:
+        summary = summary[:SUMMARY_CHARS - 3] + "..."
+    return summary
+
+
+def format_shopping_context(cart_items, wishlist_items):
+    # Compact "id:title:price" records, one line per list
+    def pack(items):
+        return ", ".join(f"{i.product_id}:{i.title}:{i.price:g}" for i in items[:CONTEXT_ITEMS])
+
+    lines = []
+    if cart_items:
+        lines.append(f"cart[{len(cart_items)}]: {pack(cart_items)}")
+    if wishlist_items:
+        lines.append(f"wishlist[{len(wishlist_items)}]: {pack(wishlist_items)}")
+    return "\n".join(lines)
+
+
+def build_messages(system_prompt, history, user_input, context="", budget=TOKEN_BUDGET):
+    """Assemble the chat payload, dropping the oldest turns to fit ``budget``.
+
+    Dropped turns are folded into a one-line summary so follow-up
+    questions keep their referent. ``user_input`` is capped at
+    MAX_INPUT_TOKENS so a single long question can't blow the budget.
+    """
+    user_input = truncate_to_tokens(user_input)
+    system = system_prompt
+    if context:
+        system += "\nShopper context (product_id:title:price):\n" + context
+
+    used = estimate_tokens(system) + estimate_tokens(user_input)
+    kept = []
+    for role, content in reversed(history):
+        cost = estimate_tokens(content)
+        if used + cost > budget:
+            break
+        kept.append((role, content))
+        used += cost
+    kept.reverse()
+
+    # A leading assistant turn without its question reads oddly; drop it
+    if kept and kept[0][0] == "assistant":
+        kept.pop(0)
+
+    dropped = history[:len(history) - len(kept)]
+    summary = _summarize(dropped)
+    if summary and used + estimate_tokens(summary) <= budget:
+        system += "\n" + summary
+
+    messages = [{"role": "system", "content": system}]
+    messages.extend({"role": role, "content": content} for role, content in kept)
+    messages.append({"role": "user", "content": user_input})
+    return messages
+
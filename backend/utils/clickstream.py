@@ -0,0 +1,134 @@
+# backend/utils/clickstream.py
+# Click tracking pipeline: drop bot traffic, suppress repeat clicks on the
+# same product within a short window, and group what is left into
+# sessions whose summaries live in click_sessions next to the raw
+# product_clicks rows.
+#
+# Dedup markers live in a dedicated bounded structure in this process,
+# apart from the shared cache, so a click burst can't push out rate-limit
+# counters or cached payloads. With several workers a repeat click that
+# lands on another worker is stored; the window is a traffic filter, not
+# an exact guarantee. The open session is the user's latest click_sessions
+# row, so every worker extends the same one.
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from backend.config import settings
+from backend.models.click_session import ClickSession
+from backend.models.product_click import ProductClick
+
+BOT_RE = re.compile(r"bot|crawl|spider|slurp|headless|python-requests|curl|wget", re.IGNORECASE)
+MAX_SESSION_PRODUCTS = 50  # cap on ids kept in ClickSession.products
+
+
+def _parse_products(value):
+    # Skips anything that isn't an id, so one bad row can't break the session
+    return [int(p) for p in (value or "").split(",") if p.strip().lstrip("-").isdigit()]
+
+
+class RecentKeys:
+    """Set of keys that each expire ``ttl`` seconds after insertion.
+
+    Every key shares one TTL, so insertion order is expiry order: expired
+    keys are dropped from the front and, past ``max_keys``, the oldest
+    live key goes first. Both are O(1) per insert.
+    """
+
+    def __init__(self, ttl, max_keys):
+        self.ttl = ttl
+        self.max_keys = max_keys
+        self._keys = OrderedDict()  # key -> expires_at, oldest first
+        self._lock = threading.Lock()
+
+    def add(self, key):
+        # True when the key was not already present, like cache.add()
+        with self._lock:
+            now = time.monotonic()
+            while self._keys:
+                oldest, expires_at = next(iter(self._keys.items()))
+                if expires_at > now:
+                    break
+                del self._keys[oldest]
+            if key in self._keys:
+                return False
+            self._keys[key] = now + self.ttl
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+            return True
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class ClickProcessor:
+    def __init__(self, window=None, session_gap=None, max_keys=None):
+        self.window = settings.click_dedup_window if window is None else window
+        self.session_gap = settings.click_session_gap if session_gap is None else session_gap
+        self.recent = RecentKeys(self.window, settings.click_dedup_max_keys if max_keys is None else max_keys)
+        self.stats = {"seen": 0, "bots": 0, "duplicates": 0, "stored": 0}
+
+    def is_bot(self, user_agent):
+        return not user_agent or bool(BOT_RE.search(user_agent))
+
+    def is_duplicate(self, user_id, product_id):
+        # add() only succeeds for the first click in each window
+        return not self.recent.add((user_id, product_id))
+
+    def _session(self, db, user_id, product_id, now):
+        session = (
+            db.query(ClickSession)
+            .filter(
+                ClickSession.user_id == user_id,
+                ClickSession.last_seen_at >= now - timedelta(seconds=self.session_gap)
+            )
+            .order_by(ClickSession.last_seen_at.desc())
+            .first()
+        )
+        if session is None:
+            # No activity within session_gap: open a new session
+            session = ClickSession(user_id=user_id, started_at=now, last_seen_at=now,
+                                   clicks=0, unique_products=0, products="")
+            db.add(session)
+
+        products = _parse_products(session.products)
+        if product_id not in products:
+            if len(products) < MAX_SESSION_PRODUCTS:
+                products.append(product_id)
+                session.products = ",".join(str(p) for p in products)
+                session.unique_products += 1
+            elif not self._clicked_since(db, user_id, product_id, session.started_at):
+                session.unique_products += 1  # past the id cap: ask product_clicks instead
+        session.clicks += 1
+        session.last_seen_at = now
+        return session
+
+    def _clicked_since(self, db, user_id, product_id, since):
+        return db.query(ProductClick.id).filter(
+            ProductClick.user_id == user_id,
+            ProductClick.product_id == product_id,
+            ProductClick.timestamp >= since
+        ).first() is not None
+
+    def record(self, db, user_id, product_id, user_agent=None):
+        """Store a click if it survives filtering; returns True when stored."""
+        self.stats["seen"] += 1
+        if self.is_bot(user_agent):
+            self.stats["bots"] += 1
+            return False
+        if self.is_duplicate(user_id, product_id):
+            self.stats["duplicates"] += 1
+            return False
+
+        # Session first: its lookups must not see this click's row yet
+        self._session(db, user_id, product_id, datetime.utcnow())
+        db.add(ProductClick(product_id=product_id, user_id=user_id))
+        db.commit()
+        self.stats["stored"] += 1
+        return True
+
+
+clicks = ClickProcessor()
@@ -0,0 +1,289 @@
+# backend/utils/images.py
+# Resized product images in a content-addressed disk cache.
+#
+# Originals are fetched once (or read from IMAGE_SOURCE_DIR when set) and
+# stored under their sha256. Variants are keyed by that hash plus width
+# and format, so a URL change upstream never serves stale bytes and two
+# products sharing an image share its variants. Every SOURCE_TTL seconds a
+# product's source is rechecked: a changed catalog URL is fetched anew, an
+# unchanged one is revalidated with a conditional GET, and if upstream is
+# unreachable the last known original keeps being served. Ids upstream
+# doesn't know are remembered for MISSING_TTL seconds. The cache directory is trimmed
+# least-recently-used first once it exceeds IMAGE_CACHE_MAX_BYTES.
+# Resizing uses the optional 'Pillow' package; without it callers fall back
+# to serving the original.
+
+import asyncio
+import hashlib
+import io
+import os
+import threading
+import time
+
+import requests
+
+from backend.config import settings
+from backend.utils.catalog import get_catalog
+
+WIDTHS = (64, 128, 256, 512)
+DEFAULT_WIDTH = 256
+FORMATS = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+PRODUCT_URL = "https://dummyjson.com/products/{}"
+SOURCE_TTL = 600             # seconds before a product's source image is rechecked
+MISSING_TTL = 600            # seconds an id without an image is remembered
+MAX_MISSING = 10000
+
+_sources = {}                # product_id -> {"digest", "checked_at", "url", "etag", "last_modified"}
+_missing = {}                # product_id -> expires_at, oldest first
+_inflight = {}               # variant key -> asyncio.Future, for request coalescing
+_evict_lock = threading.Lock()
+
+
+def _pil():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise RuntimeError("The image proxy requires the 'Pillow' package (pip install Pillow)")
+    return Image
+
+
+def _avif_supported():
+    try:
+        from PIL import features
+        return bool(features.check("avif"))
+    except Exception:
+        return False
+
+
+def _sniff(data):
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "application/octet-stream"
+
+
+def negotiate_format(accept):
+    accept = accept or ""
+    if "image/avif" in accept and _avif_supported():
+        return "avif"
+    if "image/webp" in accept:
+        return "webp"
+    return "jpeg"
+
+
+def pick_width(width):
+    # Snap to a fixed set so arbitrary ?w= values can't fill the cache
+    if not width:
+        return DEFAULT_WIDTH
+    return min(WIDTHS, key=lambda w: (w < width, abs(w - width)))
+
+
+def _cache_path(name):
+    return os.path.join(settings.image_cache_dir, name[:2], name)
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _local_source(product_id):
+    if not settings.image_source_dir:
+        return None
+    for ext in ("jpg", "jpeg", "png", "webp"):
+        path = os.path.join(settings.image_source_dir, f"{product_id}.{ext}")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+    return None
+
+
+def _remote_url(product_id):
+    for p in get_catalog():
+        if p["id"] == product_id:
+            return p.get("thumbnail")
+    response = requests.get(PRODUCT_URL.format(product_id), timeout=10)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json().get("thumbnail")
+
+
+def _store_original(product_id, data, url=None, response=None):
+    digest = hashlib.sha256(data).hexdigest()
+    path = _cache_path(f"{digest}.orig")
+    if not os.path.exists(path):
+        _write_atomic(path, data)
+    _sources[product_id] = {
+        "digest": digest,
+        "checked_at": time.monotonic(),
+        "url": url,
+        "etag": response.headers.get("ETag") if response is not None else None,
+        "last_modified": response.headers.get("Last-Modified") if response is not None else None,
+    }
+    return digest
+
+
+def _fetch_source(product_id, entry):
+    # Returns the source's digest, or None when the product has no image
+    data = _local_source(product_id)
+    if data is not None:
+        return _store_original(product_id, data)
+    url = _remote_url(product_id)
+    if not url:
+        return None
+
+    headers = {}
+    if entry and entry["url"] == url:
+        if not (entry["etag"] or entry["last_modified"]):
+            # Nothing to revalidate with; the URL is unchanged, so keep the bytes
+            entry["checked_at"] = time.monotonic()
+            return entry["digest"]
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    response = requests.get(url, headers=headers, timeout=15)
+    if response.status_code == 304:
+        entry["checked_at"] = time.monotonic()
+        return entry["digest"]
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return _store_original(product_id, response.content, url, response)
+
+
+def _source_digest(product_id):
+    """Return the sha256 of the product's original, or None if it has none."""
+    now = time.monotonic()
+    if _missing.get(product_id, 0) > now:
+        return None
+    entry = _sources.get(product_id)
+    cached = entry is not None and os.path.exists(_cache_path(f"{entry['digest']}.orig"))
+    if cached and now - entry["checked_at"] < SOURCE_TTL:
+        return entry["digest"]
+
+    try:
+        digest = _fetch_source(product_id, entry if cached else None)
+    except Exception as e:
+        if not cached:
+            raise
+        print("Image source check failed, serving the cached original:", e)
+        entry["checked_at"] = now  # try upstream again after another SOURCE_TTL
+        return entry["digest"]
+
+    if digest is None:
+        _sources.pop(product_id, None)
+        _missing.pop(product_id, None)
+        _missing[product_id] = now + MISSING_TTL
+        while len(_missing) > MAX_MISSING:
+            del _missing[next(iter(_missing))]
+    return digest
+
+
+def load_original(product_id):
+    """Return (sha256, bytes) of the product's source image, or None."""
+    digest = _source_digest(product_id)
+    if digest is None:
+        return None
+    path = _cache_path(f"{digest}.orig")
+    _touch(path)
+    with open(path, "rb") as f:
+        return digest, f.read()
+
+
+def original_file(product_id):
+    """Return (path, media type, etag) of the unresized source, or None."""
+    digest = _source_digest(product_id)
+    if digest is None:
+        return None
+    path = _cache_path(f"{digest}.orig")
+    _touch(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+    return path, _sniff(head), digest[:16]
+
+
+def render_variant(product_id, width, fmt):
+    """Return (path, etag) for a cached variant, creating it if needed."""
+    digest = _source_digest(product_id)
+    if digest is None:
+        return None
+    path = _cache_path(f"{digest}_{width}.{fmt}")
+    if os.path.exists(path):
+        _touch(path)
+        return path, digest[:16]
+
+    _, data = load_original(product_id)
+    Image = _pil()
+    image = Image.open(io.BytesIO(data))
+    image.thumbnail((width, width * 4))  # width-bound, keeps aspect ratio, never upscales
+    if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), quality=80)
+    _write_atomic(path, buffer.getvalue())
+    evict_if_needed()
+    return path, digest[:16]
+
+
+def evict_if_needed():
+    with _evict_lock:
+        entries = []
+        total = 0
+        for root, _, files in os.walk(settings.image_cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        if total <= settings.image_cache_max_bytes:
+            return
+        # Hits refresh mtime, so oldest mtime is least recently used
+        target = settings.image_cache_max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= target:
+                break
+
+
+async def get_variant(product_id, width, fmt):
+    # Concurrent first requests for the same variant share one render
+    key = (product_id, width, fmt)
+    future = _inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_event_loop().run_in_executor(None, render_variant, product_id, width, fmt)
+    _inflight[key] = future
+    try:
+        return await future
+    finally:
+        _inflight.pop(key, None)
+
+
+async def get_original(product_id):
+    return await asyncio.get_event_loop().run_in_executor(None, original_file, product_id)
@@ -0,0 +1,326 @@
+import asyncio
+import json
+import os
+import socket
+import traceback
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from backend.database import SessionLocal
+from backend.models.job import Job
+from backend.utils.backends import backends
+
+POLL_INTERVAL = 1.0      # seconds between queue polls
+RETRY_BACKOFF = 30       # seconds, multiplied by the attempt number
+DEFAULT_ATTEMPTS = 3
+LEASE_TIMEOUT = 60       # seconds without a heartbeat before a running job is presumed dead
+
+
+# --------- Cron expressions ---------
+
+def _parse_field(field, low, high):
+    values = set()
+    for part in field.split(","):
+        step = None
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = map(int, part.split("-"))
+        else:
+            start = int(part)
+            # "a/n" means every n starting at a, as in crontab
+            end = high if step else start
+        values.update(range(start, end + 1, step or 1))
+    return values
+
+
+def parse_cron(expr):
+    """Parse a 5-field cron expression (minute hour day month weekday).
+
+    Supports ``*``, ``*/n``, ``a/n``, ranges ``a-b`` (with ``/n``) and
+    lists ``a,b``. Weekday 0 is Sunday. As in crontab, when both day of
+    month and weekday are restricted a day matching either one fires.
+    Names (``mon``, ``jan``) and ``@daily``-style macros are not supported.
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"Invalid cron expression: {expr!r}")
+    bounds = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+    return [_parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, bounds)]
+
+
+def next_cron_time(expr, after):
+    minutes, hours, days, months, weekdays = parse_cron(expr)
+    fields = expr.split()
+    either_day = not fields[2].startswith("*") and not fields[4].startswith("*")
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    # Worst case is a yearly schedule; walking minute by minute is cheap enough
+    for _ in range(366 * 24 * 60):
+        day_ok = t.day in days
+        weekday_ok = (t.weekday() + 1) % 7 in weekdays
+        if (t.minute in minutes and t.hour in hours and t.month in months
+                and ((day_ok or weekday_ok) if either_day else (day_ok and weekday_ok))):
+            return t
+        t += timedelta(minutes=1)
+    raise ValueError(f"Cron expression never fires: {expr!r}")
+
+
+# --------- Runner ---------
+
+class JobRunner:
+    """In-process asyncio job scheduler backed by the ``jobs`` table.
+
+    Jobs are delivered at least once: a job is only marked ``done`` after
+    its handler returns. A claimed job carries a lease (``claimed_by`` and
+    ``claimed_at``) that its worker renews on every poll; jobs whose lease
+    is older than LEASE_TIMEOUT belonged to a dead worker and go back on
+    the queue. Jobs held by live workers are never requeued.
+    """
+
+    def __init__(self):
+        self.handlers = {}       # job_type -> (func, concurrency, max_attempts)
+        self.schedules = []      # [job_type, cron_expr, next_run]
+        self.running = Counter() # job_type -> in-flight count
+        self._task = None
+        self._inflight = set()
+        self._held = set()       # job ids this worker is running
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def register(self, job_type, concurrency=1, max_attempts=DEFAULT_ATTEMPTS):
+        def decorator(func):
+            self.handlers[job_type] = (func, concurrency, max_attempts)
+            return func
+        return decorator
+
+    def periodic(self, job_type, cron):
+        parse_cron(cron)  # fail fast on typos
+        self.schedules.append([job_type, cron, next_cron_time(cron, datetime.utcnow())])
+
+    def enqueue(self, job_type, payload=None, delay=0, db=None):
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        _, _, max_attempts = self.handlers[job_type]
+        owns_session = db is None
+        db = db or SessionLocal()
+        try:
+            job = Job(
+                job_type=job_type,
+                payload=json.dumps(payload or {}),
+                max_attempts=max_attempts,
+                run_at=datetime.utcnow() + timedelta(seconds=delay)
+            )
+            db.add(job)
+            db.commit()
+            return job.id
+        finally:
+            if owns_session:
+                db.close()
+
+    # ----- lifecycle -----
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Let in-flight jobs finish; anything interrupted is requeued once its lease expires
+        if self._inflight:
+            await asyncio.wait(self._inflight, timeout=10)
+
+    async def _loop(self):
+        while True:
+            try:
+                # SQLite calls block (up to busy_timeout when locked); keep them off the event loop
+                claimed = await asyncio.to_thread(self._poll)
+                for job_id, job_type in claimed:
+                    self.running[job_type] += 1
+                    self._held.add(job_id)
+                    task = asyncio.create_task(self._run(job_id, job_type))
+                    self._inflight.add(task)
+                    task.add_done_callback(self._inflight.discard)
+            except Exception:
+                traceback.print_exc()
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def _poll(self):
+        self._renew_leases()
+        self._requeue_expired()
+        self._enqueue_due_periodic()
+        return self._claim()
+
+    def _renew_leases(self):
+        if not self._held:
+            return
+        db = SessionLocal()
+        try:
+            (
+                db.query(Job)
+                .filter(Job.id.in_(list(self._held)), Job.claimed_by == self.worker_id)
+                .update({"claimed_at": datetime.utcnow()}, synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _requeue_expired(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=LEASE_TIMEOUT)
+        db = SessionLocal()
+        try:
+            expired = db.query(Job).filter(
+                Job.status == "running", (Job.claimed_at == None) | (Job.claimed_at < cutoff)  # noqa: E711
+            )
+            # The claim already counted this attempt; a job that keeps killing
+            # or hanging its worker must run out of attempts like any failure
+            (
+                expired.filter(Job.attempts >= Job.max_attempts)
+                .update({"status": "failed", "claimed_by": None, "claimed_at": None,
+                         "last_error": "Lease expired: worker died or hung"}, synchronize_session=False)
+            )
+            (
+                expired.filter(Job.attempts < Job.max_attempts)
+                .update({"status": "queued", "claimed_by": None, "claimed_at": None}, synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _enqueue_due_periodic(self):
+        now = datetime.utcnow()
+        for schedule in self.schedules:
+            job_type, cron, next_run = schedule
+            if next_run <= now:
+                # Every worker runs this loop; the shared cache picks one enqueuer per tick
+                if backends.cache.add(f"cron:{job_type}:{next_run.isoformat()}", 1, ttl=3600):
+                    self.enqueue(job_type)
+                schedule[2] = next_cron_time(cron, now)
+
+    def _claim(self):
+        claimed_jobs = []
+        db = SessionLocal()
+        try:
+            for job_type, (_, concurrency, _) in self.handlers.items():
+                free = concurrency - self.running[job_type]
+                if free <= 0:
+                    continue
+                candidates = (
+                    db.query(Job.id)
+                    .filter(Job.job_type == job_type, Job.status == "queued", Job.run_at <= datetime.utcnow())
+                    .order_by(Job.run_at)
+                    .limit(free)
+                    .all()
+                )
+                for (job_id,) in candidates:
+                    # Conditional update so two pollers never claim the same job
+                    claimed = (
+                        db.query(Job)
+                        .filter(Job.id == job_id, Job.status == "queued")
+                        .update({
+                            "status": "running",
+                            "attempts": Job.attempts + 1,
+                            "claimed_by": self.worker_id,
+                            "claimed_at": datetime.utcnow()
+                        })
+                    )
+                    db.commit()
+                    if claimed:
+                        claimed_jobs.append((job_id, job_type))
+            return claimed_jobs
+        finally:
+            db.close()
+
+    def _load_payload(self, job_id):
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            return json.loads(job.payload or "{}")
+        finally:
+            db.close()
+
+    def _finish(self, job_id, job_type, error):
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            if job is None or job.claimed_by != self.worker_id:
+                return  # lease expired and the job was handed to someone else
+            job.claimed_by = None
+            job.claimed_at = None
+            if error is None:
+                job.status = "done"
+                job.last_error = None
+            else:
+                job.last_error = error
+                if job.attempts < job.max_attempts:
+                    job.status = "queued"
+                    job.run_at = datetime.utcnow() + timedelta(seconds=RETRY_BACKOFF * job.attempts)
+                else:
+                    job.status = "failed"
+                print(f"Job {job_id} ({job_type}) failed:", error)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _run(self, job_id, job_type):
+        func, _, _ = self.handlers[job_type]
+        try:
+            error = None
+            try:
+                payload = await asyncio.to_thread(self._load_payload, job_id)
+                if asyncio.iscoroutinefunction(func):
+                    await func(**payload)
+                else:
+                    await asyncio.to_thread(func, **payload)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            await asyncio.to_thread(self._finish, job_id, job_type, error)
+        finally:
+            self.running[job_type] -= 1
+            self._held.discard(job_id)
+
+    # ----- introspection -----
+
+    def stats(self, db, recent=20):
+        counts = (
+            db.query(Job.job_type, Job.status, func.count())
+            .group_by(Job.job_type, Job.status)
+            .all()
+        )
+        by_type = {}
+        for job_type, status, count in counts:
+            by_type.setdefault(job_type, {})[status] = count
+        latest = db.query(Job).order_by(Job.id.desc()).limit(recent).all()
+        return {
+            "queues": by_type,
+            "in_flight": dict(self.running),
+            "concurrency": {t: c for t, (_, c, _) in self.handlers.items()},
+            "periodic": [
+                {"job_type": t, "cron": cron, "next_run": nxt.isoformat()}
+                for t, cron, nxt in self.schedules
+            ],
+            "recent": [
+                {
+                    "id": j.id,
+                    "job_type": j.job_type,
+                    "status": j.status,
+                    "attempts": j.attempts,
+                    "claimed_by": j.claimed_by,
+                    "run_at": j.run_at.isoformat() if j.run_at else None,
+                    "last_error": j.last_error
+                }
+                for j in latest
+            ]
+        }
+
+
+runner = JobRunner()
@@ -0,0 +1,188 @@
+# backend/utils/responses.py
+# Response helpers for the JSON API: a faster JSON response class,
+# precomputed payloads for cacheable data and a gzip/brotli middleware.
+
+import gzip
+import hashlib
+import json
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024   # smaller bodies cost more to compress than they save
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5         # streaming-friendly; precomputed payloads use 11
+SKIP_CONTENT_TYPES = ("image/", "video/", "audio/", "font/woff", "application/zip", "application/gzip")
+
+
+def dumps(content):
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available.
+
+    Returning one directly from a route also skips FastAPI's
+    jsonable_encoder pass, so plain dicts/lists are encoded exactly once.
+    """
+
+    def render(self, content):
+        return dumps(content)
+
+
+def _parse_accept_encoding(header):
+    # {"gzip": 1.0, "br": 0.0, ...}; a token listed without q= has q=1
+    weights = {}
+    for part in (header or "").lower().split(","):
+        token, _, params = part.partition(";")
+        token = token.strip()
+        if not token:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+    return weights
+
+
+def accepted_encoding(accept_encoding):
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values.
+
+    ``q=0`` rules an encoding out and ``*`` covers anything not listed.
+    On equal weight brotli is preferred.
+    """
+    weights = _parse_accept_encoding(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class PrecomputedJSON:
+    """A JSON payload serialized and compressed once, served many times."""
+
+    def __init__(self, content):
+        self.body = dumps(content)
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:16] + '"'
+        self.encoded = {"gzip": gzip.compress(self.body, compresslevel=9)}
+        if brotli is not None:
+            self.encoded["br"] = brotli.compress(self.body, quality=11)
+
+    def response(self, request):
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        if request.headers.get("if-none-match") == self.etag:
+            return Response(status_code=304, headers=headers)
+        encoding = accepted_encoding(request.headers.get("accept-encoding"))
+        if encoding and len(self.body) >= MIN_COMPRESS_SIZE:
+            headers["Content-Encoding"] = encoding
+            return Response(self.encoded[encoding], media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class _Compressor:
+    def __init__(self, encoding):
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress = self._obj.process
+            self.flush = self._obj.finish
+            self.sync = self._obj.flush
+        else:
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self.compress = self._obj.compress
+            self.flush = self._obj.flush
+            self.sync = lambda: self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """Negotiated br/gzip compression for HTTP responses.
+
+    Only full 200 responses are compressed. Bodies under ``minimum_size``
+    that arrive in one chunk, already-encoded responses, partial content
+    (``Content-Range``) and already-compressed media types pass through
+    untouched. Streaming responses are compressed chunk by chunk.
+    """
+
+    def __init__(self, app, minimum_size=MIN_COMPRESS_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "compressor": None, "passthrough": False}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if (message["status"] != 200 or "content-encoding" in headers
+                        or "content-range" in headers or content_type.startswith(SKIP_CONTENT_TYPES)):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    state["start"] = message  # held until we see the first body chunk
+                return
+
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if state["compressor"] is None:
+                start = state["start"]
+                if not more_body and len(body) < self.minimum_size:
+                    state["passthrough"] = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "content-length" in headers:
+                    del headers["content-length"]
+                state["compressor"] = _Compressor(encoding)
+                if not more_body:
+                    # Whole body in hand: compress in one go and send a real length
+                    data = state["compressor"].compress(body) + state["compressor"].flush()
+                    headers["Content-Length"] = str(len(data))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                await send(start)
+
+            data = state["compressor"].compress(body)
+            # Sync-flush each chunk so streamed responses (e.g. NDJSON) reach the client promptly
+            data += state["compressor"].sync() if more_body else state["compressor"].flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,28 @@
+# backend/utils/templating.py
+# One Jinja environment for every router. Compiled templates are kept in a
+# bytecode cache on disk, so a fresh worker skips parsing, and
+# warm_templates() loads them all before the first request.
+
+import os
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from backend.config import settings
+
+TEMPLATE_DIR = "backend/templates"
+
+os.makedirs(settings.template_cache_dir, exist_ok=True)
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html", "xml"]),
+    bytecode_cache=FileSystemBytecodeCache(settings.template_cache_dir),
+    auto_reload=settings.debug,  # skip per-render mtime checks in production
+)
+
+templates = Jinja2Templates(env=env)
+
+
+def warm_templates():
+    for name in env.list_templates(extensions=["html"]):
+        env.get_template(name)
@@ -2,10 +2,10 @@ from fastapi import Request, HTTPException, status, Depends
 from jose import JWTError, jwt
 from fastapi.security import HTTPBearer
 from fastapi.responses import RedirectResponse
-import os
 from datetime import datetime
+from backend.config import settings
 
-SECRET_KEY = os.getenv("JWT_SECRET_KEY", "secret")
+SECRET_KEY = settings.jwt_secret
 ALGORITHM = "HS256"
 security = HTTPBearer(auto_error=False)
 
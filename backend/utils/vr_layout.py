@@ -0,0 +1,118 @@
+# backend/utils/vr_layout.py
+# Server-side shelf placement and compact product encoding for the VR store.
+# Geometry mirrors the constants in static/js/vr_store.js.
+
+import hashlib
+import json
+import struct
+
+SHELF_ROWS = 3          # aisles, front to back
+SHELF_LEVELS = 6
+SLOTS_PER_SHELF = 14
+SHELF_START_X = -39
+SLOT_SPACING_X = 6.5
+SHELF_BASE_Y = 4
+SHELF_SPACING_Y = 7
+AISLE_START_Z = -40
+AISLE_SPACING_Z = 30
+PRODUCT_HALF_HEIGHT = 4.5 * 1.25 / 2
+
+# Packed product record: id, price, category index, texture index
+FEED_MAGIC = b"VRP1"
+FEED_HEADER = struct.Struct("<4sII")    # magic, format version, record count
+FEED_RECORD = struct.Struct("<IfHH")
+FEED_FORMAT_VERSION = 1
+
+
+def slot_position(aisle, level, slot):
+    return (
+        SHELF_START_X + slot * SLOT_SPACING_X,
+        SHELF_BASE_Y + level * SHELF_SPACING_Y + PRODUCT_HALF_HEIGHT,
+        AISLE_START_Z + aisle * AISLE_SPACING_Z,
+    )
+
+
+def aisle_z(aisle):
+    return AISLE_START_Z + aisle * AISLE_SPACING_Z
+
+
+class VRFeed:
+    """Everything the VR client needs for one catalog version, built once."""
+
+    def __init__(self, products):
+        self.categories = sorted({p.get("category") or "other" for p in products})
+        self.textures = []
+        texture_index = {}
+        # Group by category so each shelf reads as one section
+        self.products = sorted(products, key=lambda p: (p.get("category") or "other", p["id"]))
+        records = []
+        for p in self.products:
+            url = p.get("thumbnail") or ""
+            if url not in texture_index:
+                texture_index[url] = len(self.textures)
+                self.textures.append(url)
+            records.append(FEED_RECORD.pack(
+                p["id"], float(p.get("price") or 0),
+                self.categories.index(p.get("category") or "other"), texture_index[url]
+            ))
+        body = FEED_HEADER.pack(FEED_MAGIC, FEED_FORMAT_VERSION, len(records)) + b"".join(records)
+        # String tables follow the fixed-size records as one length-prefixed JSON blob
+        tables = json.dumps({
+            "categories": self.categories,
+            "textures": self.textures,
+            "titles": [p.get("title", "") for p in self.products],
+        }, separators=(",", ":")).encode()
+        self.payload = body + struct.pack("<I", len(tables)) + tables
+        self.etag = '"' + hashlib.sha1(self.payload).hexdigest()[:16] + '"'
+        self.aisles = self._place()
+
+    def _place(self):
+        # One category per shelf level, cycling through the categories across
+        # the store. A category that recurs picks up where its last shelf
+        # stopped, wrapping around to fill every slot.
+        by_category = {}
+        shown = {}
+        for index, p in enumerate(self.products):
+            by_category.setdefault(p.get("category") or "other", []).append(index)
+        aisles = []
+        for aisle in range(SHELF_ROWS):
+            levels, slots = [], []
+            for level in range(SHELF_LEVELS):
+                if not self.categories:
+                    break
+                category = self.categories[(aisle * SHELF_LEVELS + level) % len(self.categories)]
+                indexes = by_category[category]
+                start = shown.get(category, 0)
+                shown[category] = start + SLOTS_PER_SHELF
+                levels.append(category)
+                for slot in range(SLOTS_PER_SHELF):
+                    slots.append([level, slot, indexes[(start + slot) % len(indexes)]])
+            aisles.append({"aisle": aisle, "z": aisle_z(aisle), "levels": levels, "slots": slots})
+        return aisles
+
+    def layout(self):
+        return {
+            "version": self.etag.strip('"'),
+            "geometry": {
+                "shelf_start_x": SHELF_START_X,
+                "slot_spacing_x": SLOT_SPACING_X,
+                "shelf_base_y": SHELF_BASE_Y,
+                "shelf_spacing_y": SHELF_SPACING_Y,
+                "product_half_height": PRODUCT_HALF_HEIGHT,
+            },
+            "aisles": self.aisles,
+        }
+
+    def aisles_nearest(self, z):
+        return sorted(self.aisles, key=lambda a: abs(a["z"] - z))
+
+
+_feed = {"source": None, "feed": None}
+
+
+def get_feed(products):
+    # Rebuild only when the catalog object changes (catalog.refresh swaps it)
+    if _feed["source"] is not products:
+        _feed["feed"] = VRFeed(products)
+        _feed["source"] = products
+    return _feed["feed"]
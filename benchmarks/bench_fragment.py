@@ -0,0 +1,54 @@
+# benchmarks/bench_fragment.py
+# Bytes and server render time per assistant answer: re-rendering the
+# whole page (POST /ask) vs the reply partial (POST /ask/fragment).
+#
+#   python benchmarks/bench_fragment.py
+#
+# The full-page path also makes the browser reload the page and, on
+# /products, re-fetch the catalog; those costs come on top of this.
+
+import os
+import sys
+import tempfile
+import timeit
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPLY = "Here are three budget phones under $300:\n1. Phone A\n2. Phone B\n3. Phone C\n" * 3
+
+
+def make_env(cache_dir, auto_reload):
+    return Environment(
+        loader=FileSystemLoader(os.path.join(ROOT, "backend", "templates")),
+        autoescape=select_autoescape(["html", "xml"]),
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        auto_reload=auto_reload,
+    )
+
+
+def main():
+    context = {
+        "request": None, "user": "alice", "reply": REPLY, "username": "alice",
+        "total_orders": 3, "wishlist_count": 2, "cart_count": 1, "account_type": "Standard",
+        "recent_orders": [{"id": i, "date": "2026-10-01", "status": "Placed", "total": 999} for i in range(5)],
+    }
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = make_env(cache_dir, True)
+        parse_ms = timeit.timeit(lambda: cold.get_template("products.html"), number=1) * 1000
+        warm = make_env(cache_dir, True)
+        cached_ms = timeit.timeit(lambda: warm.get_template("products.html"), number=1) * 1000
+        print(f"first load of products.html: {parse_ms:.2f} ms parsed, {cached_ms:.2f} ms from bytecode cache\n")
+
+        env = make_env(cache_dir, False)
+        print(f"{'template':<28} {'bytes':>8} {'render us':>10}")
+        for name in ("products.html", "dashboard.html", "partials/ai_reply.html"):
+            template = env.get_template(name)
+            html = template.render(**context)
+            runs = 500
+            us = timeit.timeit(lambda: template.render(**context), number=runs) / runs * 1e6
+            print(f"{name:<28} {len(html.encode()):>8} {us:>10.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# benchmarks/bench_serialization.py
+# Serialization CPU and wire size for the JSON API at realistic sizes.
+#
+#   python benchmarks/bench_serialization.py
+#
+# Compares stdlib json as Starlette's JSONResponse uses it, the fallback
+# compact encoder in backend.utils.responses and orjson (when installed),
+# then the compressed size of each payload at the middleware's settings.
+
+import gzip
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_vr_payload import fake_product  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def starlette_default(content):
+    # What JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_pretty(content):
+    return json.dumps(content).encode("utf-8")
+
+
+def payloads():
+    yield "catalog x20", [fake_product(i) for i in range(1, 21)]
+    yield "catalog x100", [fake_product(i) for i in range(1, 101)]
+    yield "analytics", {
+        "daily_visits": 1234, "weekly_visits": 8765, "monthly_visits": 34567,
+        "most_viewed_products": [{"product_id": i, "clicks": 100 - i} for i in range(5)],
+        "sales_trend": [{"date": f"2026-10-{d:02d}", "sales": d * 3} for d in range(1, 8)],
+        "archived_monthly_sales": [{"month": f"2025-{m:02d}", "sales": m * 40, "revenue": m * 999.5} for m in range(1, 13)],
+        "wishlist_count": 321, "cart_count": 123,
+    }
+    yield "top-clicked", list(range(1, 11))
+
+
+def main():
+    encoders = [("json default", stdlib_pretty), ("starlette", starlette_default)]
+    if orjson is not None:
+        encoders.append(("orjson", orjson.dumps))
+    else:
+        print("(orjson not installed; install it to compare)\n")
+
+    for name, content in payloads():
+        print(f"== {name}")
+        body = starlette_default(content)
+        for label, encode in encoders:
+            runs = 2000 if len(body) < 50000 else 200
+            us = timeit.timeit(lambda: encode(content), number=runs) / runs * 1e6
+            print(f"  {label:<14} {us:>9.1f} us/encode  {len(encode(content)):>8} B")
+        gz = gzip.compress(body, compresslevel=6)
+        print(f"  gzip-6         {len(gz):>8} B ({len(gz) / len(body):.1%})"
+              + ("   below 1 KiB threshold: sent uncompressed" if len(body) < 1024 else ""))
+        if brotli is not None:
+            print(f"  br-5           {len(brotli.compress(body, quality=5)):>8} B")
+            print(f"  br-11 (precomputed) {len(brotli.compress(body, quality=11)):>3} B")
+        gz_us = timeit.timeit(lambda: gzip.compress(body, compresslevel=6), number=200) / 200 * 1e6
+        print(f"  gzip-6 cost    {gz_us:>9.1f} us (0 for precomputed catalog)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_vr_payload.py
+# Compare the VR store's product payloads: the full /api/products JSON the
+# client used to fetch against the packed /api/vr/products.bin feed.
+#
+#   python benchmarks/bench_vr_payload.py
+#
+# Reports raw and gzipped wire size, server encode time and client-side
+# decode time (parse cost is the server-measurable part of time-to-interactive).
+
+import gzip
+import json
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.vr_layout import VRFeed, FEED_HEADER, FEED_RECORD  # noqa: E402
+
+CATEGORIES = ["beauty", "fragrances", "furniture", "groceries", "smartphones", "laptops", "mens-shoes", "womens-bags"]
+
+
+def fake_product(i):
+    # Shape and field sizes follow dummyjson.com/products entries
+    return {
+        "id": i,
+        "title": f"Product number {i}",
+        "description": "A realistic length product description used to pad the payload like the upstream API does. " * 2,
+        "category": CATEGORIES[i % len(CATEGORIES)],
+        "price": round(9.99 + i * 1.37, 2),
+        "discountPercentage": 7.17,
+        "rating": 4.56,
+        "stock": 42,
+        "tags": ["tag-a", "tag-b"],
+        "brand": "Brand",
+        "sku": f"SKU-{i:06d}",
+        "weight": 2,
+        "dimensions": {"width": 23.17, "height": 14.43, "depth": 28.01},
+        "warrantyInformation": "1 month warranty",
+        "shippingInformation": "Ships in 1 month",
+        "availabilityStatus": "In Stock",
+        "reviews": [{"rating": 5, "comment": "Great!", "date": "2024-05-23T08:56:21.618Z",
+                     "reviewerName": "Reviewer", "reviewerEmail": "reviewer@example.com"}] * 3,
+        "returnPolicy": "30 days return policy",
+        "minimumOrderQuantity": 24,
+        "images": [f"https://cdn.dummyjson.com/products/images/{i}/1.png"],
+        "thumbnail": f"https://cdn.dummyjson.com/products/images/{i % 50}/thumbnail.png",
+    }
+
+
+def decode_packed(payload):
+    _, _, count = FEED_HEADER.unpack_from(payload)
+    end = FEED_HEADER.size + count * FEED_RECORD.size
+    records = list(FEED_RECORD.iter_unpack(payload[FEED_HEADER.size:end]))
+    (length,) = struct.unpack_from("<I", payload, end)
+    tables = json.loads(payload[end + 4:end + 4 + length])
+    return records, tables
+
+
+def main():
+    print(f"{'products':>8} {'json B':>9} {'json gz':>8} {'packed B':>9} {'packed gz':>9} "
+          f"{'json dec us':>11} {'pack dec us':>11} {'pack enc us':>11}")
+    for n in (20, 100, 1000, 5000):
+        products = [fake_product(i) for i in range(1, n + 1)]
+        as_json = json.dumps(products).encode()
+        feed = VRFeed(products)
+        packed = feed.payload
+
+        runs = max(5, 2000 // n)
+        json_dec = timeit.timeit(lambda: json.loads(as_json), number=runs) / runs * 1e6
+        pack_dec = timeit.timeit(lambda: decode_packed(packed), number=runs) / runs * 1e6
+        pack_enc = timeit.timeit(lambda: VRFeed(products), number=runs) / runs * 1e6
+        print(f"{n:>8} {len(as_json):>9} {len(gzip.compress(as_json)):>8} {len(packed):>9} "
+              f"{len(gzip.compress(packed)):>9} {json_dec:>11.0f} {pack_dec:>11.0f} {pack_enc:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
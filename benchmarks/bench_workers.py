@@ -0,0 +1,86 @@
+# benchmarks/bench_workers.py
+# Throughput of read-heavy routes as uvicorn worker count grows.
+#
+#   python benchmarks/bench_workers.py --max-workers 4 --seconds 10
+#
+# Each run starts `uvicorn backend.main:app --workers N`, drives it with
+# client processes using keep-alive connections and prints requests/s
+# plus the speedup over one worker. Use STATE_BACKEND=redis to measure
+# the shared-state mode.
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+ROUTES = ["/tdmodels", "/", "/login"]
+
+
+def _client(port, seconds, counter):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        conn.request("GET", ROUTES[done % len(ROUTES)])
+        conn.getresponse().read()
+        done += 1
+    conn.close()
+    with counter.get_lock():
+        counter.value += done
+
+
+def _wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/tdmodels")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def run(workers, port, seconds, clients):
+    env = dict(os.environ, RUN_JOBS="0", DEBUG="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--workers", str(workers),
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env
+    )
+    try:
+        _wait_ready(port)
+        counter = multiprocessing.Value("i", 0)
+        procs = [multiprocessing.Process(target=_client, args=(port, seconds, counter)) for _ in range(clients)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return counter.value / seconds
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients-per-worker", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'workers':>7} {'req/s':>10} {'speedup':>8}")
+    for workers in range(1, args.max_workers + 1):
+        rps = run(workers, args.port, args.seconds, workers * args.clients_per_worker)
+        baseline = baseline or rps
+        print(f"{workers:>7} {rps:>10.0f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
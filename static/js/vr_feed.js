@@ -0,0 +1,62 @@
+// Decoder for /api/vr/products.bin (see backend/utils/vr_layout.py).
+// Layout: "VRP1" | u32 version | u32 count | count x (u32 id, f32 price,
+// u16 category, u16 texture) | u32 length | JSON string tables.
+
+let cached = null;
+
+// Raised by streamVRLayout when the layout belongs to another catalog version
+export class StaleFeedError extends Error {}
+
+// Resolves to { version, products }; version pairs the products with a layout
+export async function loadVRProducts({ reload = false } = {}) {
+  const headers = cached && !reload ? { 'If-None-Match': cached.etag } : {};
+  const res = await fetch('/api/vr/products.bin', { headers, cache: reload ? 'no-store' : 'default' });
+  if (res.status === 304 && cached) return cached;
+
+  const buf = await res.arrayBuffer();
+  const view = new DataView(buf);
+  const count = view.getUint32(8, true);
+  let offset = 12;
+  const records = [];
+  for (let i = 0; i < count; i++, offset += 12) {
+    records.push([
+      view.getUint32(offset, true),
+      view.getFloat32(offset + 4, true),
+      view.getUint16(offset + 8, true),
+      view.getUint16(offset + 10, true)
+    ]);
+  }
+  const tablesLength = view.getUint32(offset, true);
+  const tables = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, offset + 4, tablesLength)));
+
+  const products = records.map(([id, price, category, texture], i) => ({
+    id,
+    price: Math.round(price * 100) / 100,
+    category: tables.categories[category],
+    thumbnail: tables.textures[texture],
+    title: tables.titles[i]
+  }));
+  const etag = res.headers.get('ETag');
+  cached = { etag, version: etag.replace(/"/g, ''), products };
+  return cached;
+}
+
+// Yields aisles nearest to `z` first so the closest shelves can render immediately.
+// Slot indexes refer to the products of `version`; the server refuses any other.
+export async function* streamVRLayout(z, version) {
+  const res = await fetch(`/api/vr/layout/stream?z=${z}&v=${encodeURIComponent(version)}`);
+  if (res.status === 409) throw new StaleFeedError('VR catalog changed while loading');
+  if (!res.ok) throw new Error(`Layout request failed: ${res.status}`);
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let pending = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    pending += decoder.decode(value, { stream: true });
+    const lines = pending.split('\n');
+    pending = lines.pop();
+    for (const line of lines) if (line) yield JSON.parse(line);
+  }
+  if (pending) yield JSON.parse(pending);
+}